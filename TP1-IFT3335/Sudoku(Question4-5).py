@@ -1,439 +1,588 @@
-## Solve Every Sudoku Puzzle
-
-## See http://norvig.com/sudoku.html
-
-## Throughout this program we have:
-##   r is a row,    e.g. 'A'
-##   c is a column, e.g. '3'
-##   s is a square, e.g. 'A3'
-##   d is a digit,  e.g. '9'
-##   u is a unit,   e.g. ['A1','B1','C1','D1','E1','F1','G1','H1','I1']
-##   grid is a grid,e.g. 81 non-blank chars, e.g. starting with '.18...7...
-##   values is a dict of possible values, e.g. {'A1':'12349', 'A2':'8', ...}
-
-import time, numpy
-
-def cross(A, B):
-    "Cross product of elements in A and elements in B."
-    return [a + b for a in A for b in B]
-
-
-digits = '123456789'
-rows = 'ABCDEFGHI'
-cols = digits
-squares = cross(rows, cols)
-unitlist = ([cross(rows, c) for c in cols] +
-            [cross(r, cols) for r in rows] +
-            [cross(rs, cs) for rs in ('ABC', 'DEF', 'GHI') for cs in ('123', '456', '789')])
-units = dict((s, [u for u in unitlist if s in u])
-             for s in squares)
-peers = dict((s, set(sum(units[s], [])) - set([s]))
-             for s in squares)
-
-
-################ Unit Tests ################
-
-def test():
-    "A set of tests that must pass."
-    assert len(squares) == 81
-    assert len(unitlist) == 27
-    assert all(len(units[s]) == 3 for s in squares)
-    assert all(len(peers[s]) == 20 for s in squares)
-    assert units['C2'] == [['A2', 'B2', 'C2', 'D2', 'E2', 'F2', 'G2', 'H2', 'I2'],
-                           ['C1', 'C2', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'C9'],
-                           ['A1', 'A2', 'A3', 'B1', 'B2', 'B3', 'C1', 'C2', 'C3']]
-    assert peers['C2'] == set(['A2', 'B2', 'D2', 'E2', 'F2', 'G2', 'H2', 'I2',
-                               'C1', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'C9',
-                               'A1', 'A3', 'B1', 'B3'])
-    print('All tests pass.')
-
-
-################ Parse a Grid ################
-
-def initialize_values(grid):
-    """initialize the values dictionary based on the provided grid"""
-    values = dict(zip(squares, grid))
-    return values
-
-
-def parse_grid(grid):
-    """Convert grid to a dict of possible values, {square: digits}, or
-    return False if a contradiction is detected."""
-    ## To start, every square can be any digit; then assign values from the grid.
-    values = dict((s, digits) for s in squares)
-    for s, d in grid_values(grid).items():
-        if d in digits and not assign(values, s, d):
-            return False  ## (Fail if we can't assign d to square s.)
-    return values
-
-
-def grid_values(grid):
-    "Convert grid into a dict of {square: char} with '0' or '.' for empties."
-    chars = [c for c in grid if c in digits or c in '0.']
-    assert len(chars) == 81
-    return dict(zip(squares, chars))
-
-
-################ Constraint Propagation ################
-
-def assign(values, s, d):
-    """Eliminate all the other values (except d) from values[s] and propagate.
-    Return values, except return False if a contradiction is detected."""
-    other_values = values[s].replace(d, '')
-    if all(eliminate(values, s, d2) for d2 in other_values):
-        return values
-    else:
-        return False
-
-
-def eliminate(values, s, d):
-    """Eliminate d from values[s]; propagate when values or places <= 2.
-    Return values, except return False if a contradiction is detected."""
-    if d not in values[s]:
-        return values  ## Already eliminated
-    values[s] = values[s].replace(d, '')
-    ## (1) If a square s is reduced to one value d2, then eliminate d2 from the peers.
-    if len(values[s]) == 0:
-        return False  ## Contradiction: removed last value
-    elif len(values[s]) == 1:
-        d2 = values[s]
-        if not all(eliminate(values, s2, d2) for s2 in peers[s]):
-            return False
-    ## (2) If a unit u is reduced to only one place for a value d, then put it there.
-    for u in units[s]:
-        dplaces = [s for s in u if d in values[s]]
-        if len(dplaces) == 0:
-            return False  ## Contradiction: no place for this value
-        elif len(dplaces) == 1:
-            # d can only be in one place in unit; assign it there
-            if not assign(values, dplaces[0], d):
-                return False
-    return values
-
-
-################ Display as 2-D grid ################
-# this function as been modified from what we've received
-def display(values):
-    "Display these values as a 2-D grid."
-    width = 1 + max(len(str(values[s])) for s in squares)
-    line = '+'.join(['-' * (width * 3)] * 3)
-    for r in rows:
-        row_str = ''.join(str(values[r + c]).center(width) + ('|' if c in '36' else '') for c in cols)
-        print(row_str)
-        if r in 'CF':
-            print(line)
-
-
-################ Search ################
-
-def solve(grid): return search(parse_grid(grid))
-
-
-def search(values):
-    "Using depth-first search and propagation, try all possible values."
-    if values is False:
-        return False  ## Failed earlier
-    if all(len(values[s]) == 1 for s in squares):
-        return values  ## Solved!
-    ## Chose the unfilled square s with the fewest possibilities
-    n, s = min((len(values[s]), s) for s in squares if len(values[s]) > 1)
-    return some(search(assign(values.copy(), s, d))
-                for d in values[s])
-
-
-################ Utilities ################
-
-def some(seq):
-    "Return some element of seq that is true."
-    for e in seq:
-        if e: return e
-    return False
-
-
-def from_file(filename, sep='\n'):
-    "Parse a file into a list of strings, separated by sep."
-    return open(filename).read().strip().split(sep)
-
-
-def shuffled(seq):
-    "Return a randomly shuffled copy of the input sequence."
-    seq = list(seq)
-    random.shuffle(seq)
-    return seq
-
-
-################ System test ################
-
-import time, numpy
-
-def solve_all(grids, name='', showif=0.0):
-    """Attempt to solve a sequence of grids. Report results.
-    When showif is a number of seconds, display puzzles that take longer.
-    When showif is None, don't display any puzzles."""
-
-    def time_solve(grid):
-        start = time.perf_counter()
-        values = apply_hill_climbing_annealing(initialize_values(grid))
-        t = time.perf_counter() - start
-        ## Display puzzles that take long enough
-        if showif is not None and t > showif:
-            display(grid_values(grid))
-            if values: display(values)
-            print('(%.2f seconds)\n' % t)
-        return (t, solved(values))
-
-    times, results = zip(*[time_solve(grid) for grid in grids])
-    N = len(grids)
-    if N >1:
-        print("Solved %d of %d %s puzzles (avg %.2f secs (%d Hz), max %.2f secs)." % (
-            sum(results), N, name, sum(times) / N, N / sum(times), max(times)))
-
-def solved(values):
-    "A puzzle is solved if each unit is a permutation of the digits 1 to 9."
-
-    def unitsolved(unit): return set(values[s] for s in unit) == set(digits)
-
-    return values is not False and all(unitsolved(unit) for unit in unitlist)
-
-
-def random_puzzle(N=17):
-    """Make a random puzzle with N or more assignments. Restart on contradictions.
-    Note the resulting puzzle is not guaranteed to be solvable, but empirically
-    about 99.8% of them are solvable. Some have multiple solutions."""
-    values = dict((s, digits) for s in squares)
-    for s in shuffled(squares):
-        if not assign(values, s, random.choice(values[s])):
-            break
-        ds = [values[s] for s in squares if len(values[s]) == 1]
-        if len(ds) >= N and len(set(ds)) >= 8:
-            return ''.join(values[s] if len(values[s]) == 1 else '.' for s in squares)
-    return random_puzzle(N)  ## Give up and make a new puzzle
-
-
-#=========Implementation question 4 & 5
-def fill_randomly(square):
-    '''fill the square randomly respecting the constraints'''
-    values = ['1', '2', '3', '4', '5', '6', '7', '8', '9']
-    random.shuffle(values)
-    #values = ['5', '2', '1', '4', '3', '6', '9', '8', '7']  # to remove just for test
-    for i in range(len(square)):
-        if square[i] == '0':
-            if not values:
-                break  # No more values available, break the loop
-
-            for j in range(len(values)):
-                if values[j] not in square:
-                    square[i] = values[j]
-                    break
-    return square
-
-def fill(current_configuration, boxes):
-    '''fill the squares randomly'''
-    for i in range(81):
-        # extract the square from the current configuration based on the boxes
-        if i == 0 or i == 3 or i == 6 \
-                or i == 29 or i == 32 or i == 35 \
-                or i == 54 or i == 57 or i == 60:
-            square_keys = boxes[i][2]
-            square = [current_configuration[key] for key in square_keys]
-            j = i + 3
-            # crreate a copy of the current configuration
-            new_configuration = current_configuration.copy()
-
-            # apply a swap within the selected square
-            filled_square = fill_randomly(square)
-
-            # update the new configuration with the filled square
-            for key, value in zip(square_keys, filled_square):
-                new_configuration[key] = value
-
-            # count conflicts in the new configuration
-            current_configuration = new_configuration.copy()
-
-    return current_configuration
-
-def count_general_conflicts(configuration):
-    '''check conflicts in all the square'''
-    conflicts = 0
-
-    # Check conflicts in rows
-    for row in rows:
-        row_values = [configuration[row + str(i)] for i in range(1, 10)]
-        for i in range(9):
-            for j in range(i + 1, 9):
-                if row_values[i] != '0' and row_values[i] == row_values[j]:
-                    conflicts += 1
-    # Check conflicts in columns
-    for col in cols:
-        col_values = [configuration[row + col] for row in rows]
-        for i in range(9):
-            for j in range(i + 1, 9):
-                if col_values[i] != '0' and col_values[i] == col_values[j]:
-                    conflicts += 1
-    return conflicts
-
-#=============Hill climbing===============
-from itertools import combinations
-
-def apply_hill_climbing(puzzle):
-    max_iterations = 150
-    current_configuration = puzzle.copy()
-    boxes = list(units.values())
-
-    # generate initial solution
-    current_configuration = fill(current_configuration, boxes)
-    for _ in range(max_iterations):
-        best_conflict = count_general_conflicts(current_configuration)
-        if best_conflict == 0:
-            print("solved!")
-            break
-
-        next_configuration = find_best_neighbor(current_configuration, boxes)
-        next_conflict = count_general_conflicts(next_configuration)
-
-        if next_conflict < best_conflict:
-            current_configuration = next_configuration.copy()
-        else:
-            return current_configuration
-
-    return current_configuration
-
-def find_best_neighbor(current_configuration, boxes):
-    '''generate all possible neighbors by swapping digits
-    in the same box'''
-    neighbors = []
-    square_index = random.choice(range(len(boxes)))
-    square_keys = boxes[square_index][2]
-    for combo in combinations(range(9), 2):
-        new_configuration = current_configuration.copy()
-        square = [current_configuration[key] for key in square_keys]
-        square[combo[0]], square[combo[1]] = square[combo[1]], square[combo[0]]
-        for key, value in zip(square_keys, square):
-            new_configuration[key] = value
-        neighbors.append(new_configuration)
-
-    # find the neighbor with the lowest conflict count
-    best_neighbor = min(neighbors, key=count_general_conflicts)
-    return best_neighbor
-
-#============Simulated Annealing===========================
-import random
-import math
-def apply_hill_climbing_annealing(puzzle, initial_temperature=1.15, alpha=0.99):
-    iterations = 500
-    initial_configuration = puzzle.copy()
-    current_configuration = initial_configuration.copy()
-    temperature = initial_temperature
-    boxes = list(units.values())
-
-    # fill the squares randomly
-    current_configuration = fill(current_configuration, boxes)
-    best_configuration = current_configuration.copy()
-
-    for step in range(1, iterations + 1):
-        best_conflict = count_general_conflicts(current_configuration)
-
-        # Update temperature
-        temperature = alpha * temperature
-        if temperature == 0:
-            return best_configuration
-
-        # find the best neighboring state
-        neighbouring_state = find_best_neighbor(current_configuration, boxes)
-
-
-        # determine the energy of the current and neighbouring state
-        neighbouring_energy = count_general_conflicts(neighbouring_state)
-        current_energy = count_general_conflicts(current_configuration)
-
-        # calculate deltaE
-        deltaE = neighbouring_energy - current_energy
-
-        # if the neighbouring state has a lower energy than the current or if the acceptance probability is fulfilled
-        if deltaE < 0 or random.random() < math.exp(deltaE / temperature):
-            current_configuration = neighbouring_state.copy()
-            best_conflict = neighbouring_energy
-            best_configuration = current_configuration.copy()
-
-        if best_conflict == 0:
-            print("Solved")
-            break
-
-    print("Best conflict:", best_conflict)
-    return best_configuration
-
-#============ END Simulated Annealing===========================
-
-
-
-grid1 = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
-grid2 = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
-hard1 = '.....6....59.....82....8....45........3........6..3.54...325..6..................'
-
-
-### Custom tests ###
-
-# test apply_hill_climbing function
-def test_apply_hill_climbing():
-    #initial_grid = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
-    with open('100sudoku.txt', 'r') as file:
-        grids = file.readlines()
-    for idx, grid in enumerate(grids):
-        initial_values = initialize_values(grid.strip())
-
-        print(f"Grid {idx + 1} - Initial Configuration:")
-        display(initial_values)
-
-        updated_values = apply_hill_climbing(initial_values)
-
-        print(f"Grid {idx + 1} - After Applying Hill-Climbing:")
-        display(updated_values)
-        print("\n" + "="*50)  # Separator between grids
-
-def test_apply_simulated_annealing():
-    with open('100sudoku.txt', 'r') as file:
-        grids = file.readlines()
-    for idx, grid in enumerate(grids):
-        initial_values = initialize_values(grid.strip())
-
-        print(f"Grid {idx + 1} - Initial Configuration:")
-        display(initial_values)
-
-        updated_values = apply_hill_climbing_annealing(initial_values)
-
-        print(f"Grid {idx + 1} - After Applying Simulated Annealing:")
-        display(updated_values)
-        print("\n" + "="*50)  # separator between grids
-
-def test_one():
-    initial_values = initialize_values(grid1)
-    print("initial configuration")
-    display(initial_values)
-
-    updated_values = apply_hill_climbing_annealing(initial_values)
-
-    print("After Applying Hill-Climbing:")
-    display(updated_values)
-
-# test count_conflicts function
-
-if __name__ == '__main__':
-    test()
-    # Run the custom tests
-    solve_all(from_file("100sudoku.txt"), '', None)
-    #test_one()
-    #test_apply_hill_climbing()
-    #test_apply_simulated_annealing()
-    #test_count_conflicts()
-    # solve_all(from_file("100sudoku.txt"), "100sudoku", 0.005)
-    # solve_all(from_file("easy50.txt", '========'), "easy", None)
-    # solve_all(from_file("easy50.txt", '========'), "easy", None)
-    # solve_all(from_file("top95.txt"), "hard", None)
-    # solve_all(from_file("hardest.txt"), "hardest", None)
-    # solve_all([random_puzzle() for _ in range(99)], "random", 100.0)
-
-## References used:
-## http://www.scanraid.com/BasicStrategies.htm
-## http://www.sudokudragon.com/sudokustrategy.htm
-## http://www.krazydad.com/blog/2005/09/29/an-index-of-sudoku-strategies/
-## http://www2.warwick.ac.uk/fac/sci/moac/currentstudents/peter_cock/python/sudoku/
+## Solve Every Sudoku Puzzle
+
+## See http://norvig.com/sudoku.html
+
+## Throughout this program we have:
+##   r is a row,    e.g. 'A'
+##   c is a column, e.g. '3'
+##   s is a square, e.g. 'A3'
+##   d is a digit,  e.g. '9'
+##   u is a unit,   e.g. ['A1','B1','C1','D1','E1','F1','G1','H1','I1']
+##   grid is a grid,e.g. 81 non-blank chars, e.g. starting with '.18...7...
+##   values is a dict of possible values, e.g. {'A1':'12349', 'A2':'8', ...}
+
+import time, numpy
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional: without it the kernels run as plain Python
+    def njit(*args, **kwargs):
+        def wrap(f): return f
+        return wrap
+
+def cross(A, B):
+    "Cross product of elements in A and elements in B."
+    return [a + b for a in A for b in B]
+
+
+digits = '123456789'
+rows = 'ABCDEFGHI'
+cols = digits
+squares = cross(rows, cols)
+unitlist = ([cross(rows, c) for c in cols] +
+            [cross(r, cols) for r in rows] +
+            [cross(rs, cs) for rs in ('ABC', 'DEF', 'GHI') for cs in ('123', '456', '789')])
+units = dict((s, [u for u in unitlist if s in u])
+             for s in squares)
+peers = dict((s, set(sum(units[s], [])) - set([s]))
+             for s in squares)
+
+## Square-id (0..80) indexing for the array-based solvers: the configuration
+## is a numpy.uint8 array of 81 digits (0 = empty) instead of a dict of strings.
+sq_id = dict((s, i) for i, s in enumerate(squares))
+row_idx = numpy.array([[sq_id[r + c] for c in cols] for r in rows], dtype=numpy.int8)
+col_idx = numpy.array([[sq_id[r + c] for r in rows] for c in cols], dtype=numpy.int8)
+box_idx = numpy.array([[sq_id[s] for s in cross(rs, cs)]
+                       for rs in ('ABC', 'DEF', 'GHI') for cs in ('123', '456', '789')],
+                      dtype=numpy.int8)
+## All row and column units stacked as one (18, 9) table, so conflicts can be
+## counted in a single gather.  Boxes are filled without duplicates and never
+## conflict, so (as before) they are not checked.
+units_idx = numpy.concatenate((row_idx, col_idx))
+## Upper-triangle cell pairs (i < j) within a unit, for pairwise comparison.
+pair_i, pair_j = numpy.triu_indices(9, 1)
+## All 27 units (rows, columns and boxes), for the solved() check.
+full_units_idx = numpy.concatenate((units_idx, box_idx))
+sorted_unit = numpy.arange(1, 10, dtype=numpy.uint8)
+## Generator used by the array-based solvers (reseeded per worker when
+## running parallel restarts); faster than the random module for shuffles.
+rng = numpy.random.default_rng()
+## units.values() snapshot used by the neighbor search, built once instead of
+## per solve call.
+unit_values = list(units.values())
+
+
+def values_from_array(state):
+    "Convert a uint8 configuration array back to a {square: char} dict."
+    return dict((s, str(int(state[sq_id[s]]))) for s in squares)
+
+
+################ Unit Tests ################
+
+def test():
+    "A set of tests that must pass."
+    assert len(squares) == 81
+    assert len(unitlist) == 27
+    assert all(len(units[s]) == 3 for s in squares)
+    assert all(len(peers[s]) == 20 for s in squares)
+    assert units['C2'] == [['A2', 'B2', 'C2', 'D2', 'E2', 'F2', 'G2', 'H2', 'I2'],
+                           ['C1', 'C2', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'C9'],
+                           ['A1', 'A2', 'A3', 'B1', 'B2', 'B3', 'C1', 'C2', 'C3']]
+    assert peers['C2'] == set(['A2', 'B2', 'D2', 'E2', 'F2', 'G2', 'H2', 'I2',
+                               'C1', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'C9',
+                               'A1', 'A3', 'B1', 'B3'])
+    print('All tests pass.')
+
+
+################ Parse a Grid ################
+
+def initialize_values(grid):
+    """initialize the configuration array based on the provided grid"""
+    values = numpy.array([int(c) if c in digits else 0 for c in grid[:81]],
+                         dtype=numpy.uint8)
+    return values
+
+
+def parse_grid(grid):
+    """Convert grid to a dict of possible values, {square: digits}, or
+    return False if a contradiction is detected."""
+    ## To start, every square can be any digit; then assign values from the grid.
+    values = dict((s, digits) for s in squares)
+    for s, d in grid_values(grid).items():
+        if d in digits and not assign(values, s, d):
+            return False  ## (Fail if we can't assign d to square s.)
+    return values
+
+
+def grid_values(grid):
+    "Convert grid into a dict of {square: char} with '0' or '.' for empties."
+    chars = [c for c in grid if c in digits or c in '0.']
+    assert len(chars) == 81
+    return dict(zip(squares, chars))
+
+
+################ Constraint Propagation ################
+
+def assign(values, s, d):
+    """Eliminate all the other values (except d) from values[s] and propagate.
+    Return values, except return False if a contradiction is detected."""
+    other_values = values[s].replace(d, '')
+    if all(eliminate(values, s, d2) for d2 in other_values):
+        return values
+    else:
+        return False
+
+
+def eliminate(values, s, d):
+    """Eliminate d from values[s]; propagate when values or places <= 2.
+    Return values, except return False if a contradiction is detected."""
+    if d not in values[s]:
+        return values  ## Already eliminated
+    values[s] = values[s].replace(d, '')
+    ## (1) If a square s is reduced to one value d2, then eliminate d2 from the peers.
+    if len(values[s]) == 0:
+        return False  ## Contradiction: removed last value
+    elif len(values[s]) == 1:
+        d2 = values[s]
+        if not all(eliminate(values, s2, d2) for s2 in peers[s]):
+            return False
+    ## (2) If a unit u is reduced to only one place for a value d, then put it there.
+    for u in units[s]:
+        dplaces = [s for s in u if d in values[s]]
+        if len(dplaces) == 0:
+            return False  ## Contradiction: no place for this value
+        elif len(dplaces) == 1:
+            # d can only be in one place in unit; assign it there
+            if not assign(values, dplaces[0], d):
+                return False
+    return values
+
+
+################ Display as 2-D grid ################
+# this function as been modified from what we've received
+def display(values):
+    "Display these values as a 2-D grid."
+    if isinstance(values, numpy.ndarray):
+        values = values_from_array(values)
+    width = 1 + max(len(str(values[s])) for s in squares)
+    line = '+'.join(['-' * (width * 3)] * 3)
+    for r in rows:
+        row_str = ''.join(str(values[r + c]).center(width) + ('|' if c in '36' else '') for c in cols)
+        print(row_str)
+        if r in 'CF':
+            print(line)
+
+
+################ Search ################
+
+def solve(grid): return search(parse_grid(grid))
+
+
+def search(values):
+    "Using depth-first search and propagation, try all possible values."
+    if values is False:
+        return False  ## Failed earlier
+    if all(len(values[s]) == 1 for s in squares):
+        return values  ## Solved!
+    ## Chose the unfilled square s with the fewest possibilities
+    n, s = min((len(values[s]), s) for s in squares if len(values[s]) > 1)
+    return some(search(assign(values.copy(), s, d))
+                for d in values[s])
+
+
+################ Utilities ################
+
+def some(seq):
+    "Return some element of seq that is true."
+    for e in seq:
+        if e: return e
+    return False
+
+
+def from_file(filename, sep='\n'):
+    "Parse a file into a list of strings, separated by sep."
+    return open(filename).read().strip().split(sep)
+
+
+def shuffled(seq):
+    "Return a randomly shuffled copy of the input sequence."
+    seq = list(seq)
+    random.shuffle(seq)
+    return seq
+
+
+################ System test ################
+
+import time, numpy
+
+def solve_all(grids, name='', showif=0.0):
+    """Attempt to solve a sequence of grids. Report results.
+    When showif is a number of seconds, display puzzles that take longer.
+    When showif is None, don't display any puzzles."""
+
+    def time_solve(grid):
+        start = time.perf_counter()
+        ## constraint propagation + search solves most grids near-instantly;
+        ## only fall back to stochastic annealing when it fails
+        values = solve(grid)
+        if not values:
+            values = apply_hill_climbing_annealing(initialize_values(grid))
+        t = time.perf_counter() - start
+        ## Display puzzles that take long enough
+        if showif is not None and t > showif:
+            display(grid_values(grid))
+            if values: display(values)
+            print('(%.2f seconds)\n' % t)
+        return (t, solved(values))
+
+    times, results = zip(*[time_solve(grid) for grid in grids])
+    N = len(grids)
+    if N >1:
+        print("Solved %d of %d %s puzzles (avg %.2f secs (%d Hz), max %.2f secs)." % (
+            sum(results), N, name, sum(times) / N, N / sum(times), max(times)))
+
+def solved(values):
+    "A puzzle is solved if each unit is a permutation of the digits 1 to 9."
+    if isinstance(values, numpy.ndarray):
+        # one vectorized check: every sorted unit must read 1..9
+        return bool((numpy.sort(values[full_units_idx], axis=1) == sorted_unit).all())
+
+    def unitsolved(unit): return set(values[s] for s in unit) == set(digits)
+
+    return values is not False and all(unitsolved(unit) for unit in unitlist)
+
+
+def random_puzzle(N=17):
+    """Make a random puzzle with N or more assignments. Restart on contradictions.
+    Note the resulting puzzle is not guaranteed to be solvable, but empirically
+    about 99.8% of them are solvable. Some have multiple solutions."""
+    values = dict((s, digits) for s in squares)
+    for s in shuffled(squares):
+        if not assign(values, s, random.choice(values[s])):
+            break
+        ds = [values[s] for s in squares if len(values[s]) == 1]
+        if len(ds) >= N and len(set(ds)) >= 8:
+            return ''.join(values[s] if len(values[s]) == 1 else '.' for s in squares)
+    return random_puzzle(N)  ## Give up and make a new puzzle
+
+
+#=========Implementation question 4 & 5
+## digits 1..9, reshuffled in place by fill_randomly instead of allocating a
+## fresh array per box
+_fill_digits = numpy.arange(1, 10, dtype=numpy.uint8)
+
+def fill_randomly(square):
+    '''fill the square (a uint8 array of 9 cells) randomly respecting the constraints'''
+    # 9-bit mask of digits already present, instead of `in square` scans
+    # (int(v): shifting by a uint8 would wrap the result to 8 bits)
+    used = 0
+    for v in square:
+        if v != 0:
+            used |= 1 << (int(v) - 1)
+    rng.shuffle(_fill_digits)
+    free = [d for d in _fill_digits if not used >> (int(d) - 1) & 1]
+    k = 0
+    for i in range(len(square)):
+        if square[i] == 0:
+            if k == len(free):
+                break  # No more values available, break the loop
+            square[i] = free[k]
+            k += 1
+    return square
+
+def fill(current_configuration):
+    '''fill the squares randomly, one box at a time'''
+    for box_ids in box_idx:
+        # fancy indexing extracts a 9-cell copy of the box; fill it and
+        # write it back into the configuration
+        filled_square = fill_randomly(current_configuration[box_ids])
+        current_configuration[box_ids] = filled_square
+
+    return current_configuration
+
+def count_general_conflicts(configuration):
+    '''check conflicts in all the square'''
+    # gather every row and column unit at once: an (18, 9) matrix of digits
+    cells = configuration[units_idx]
+    # compare every pair of cells (i < j) in each unit in one shot
+    left, right = cells[:, pair_i], cells[:, pair_j]
+    return int(((left == right) & (left != 0)).sum())
+
+#=============Hill climbing===============
+from itertools import combinations
+
+def apply_hill_climbing(puzzle):
+    max_iterations = 150
+    current_configuration = puzzle.copy()
+    boxes = unit_values
+
+    # generate initial solution
+    current_configuration = fill(current_configuration)
+    for _ in range(max_iterations):
+        best_conflict = count_general_conflicts(current_configuration)
+        if best_conflict == 0:
+            print("solved!")
+            break
+
+        next_configuration = find_best_neighbor(current_configuration, boxes)
+        next_conflict = count_general_conflicts(next_configuration)
+
+        if next_conflict < best_conflict:
+            current_configuration = next_configuration.copy()
+        else:
+            return current_configuration
+
+    return current_configuration
+
+def find_best_neighbor(current_configuration, boxes):
+    '''generate all possible neighbors by swapping digits
+    in the same box'''
+    square_index = int(rng.integers(len(boxes)))
+    square_ids = [sq_id[key] for key in boxes[square_index][2]]
+
+    # single pass: score each swap by conflict delta and keep the argmin,
+    # instead of materializing 36 candidate configurations
+    rcnt, ccnt = _build_count_tables(current_configuration)
+    best_delta = 1 << 30
+    best_swap = (square_ids[0], square_ids[1])
+    for combo in combinations(range(9), 2):
+        a, b = square_ids[combo[0]], square_ids[combo[1]]
+        delta = _swap_delta(current_configuration, rcnt, ccnt, a, b)
+        if delta < best_delta:
+            best_delta = delta
+            best_swap = (a, b)
+
+    # apply the winning swap on a single copy
+    best_neighbor = current_configuration.copy()
+    a, b = best_swap
+    best_neighbor[a], best_neighbor[b] = best_neighbor[b], best_neighbor[a]
+    return best_neighbor
+
+#============Simulated Annealing===========================
+import random
+import math
+import os
+import multiprocessing
+
+@njit(cache=True)
+def _count_conflicts(configuration, units_idx):
+    '''njit-friendly scalar version of count_general_conflicts'''
+    conflicts = 0
+    for u in range(units_idx.shape[0]):
+        for i in range(9):
+            vi = configuration[units_idx[u, i]]
+            if vi == 0:
+                continue
+            for j in range(i + 1, 9):
+                if vi == configuration[units_idx[u, j]]:
+                    conflicts += 1
+    return conflicts
+
+@njit(cache=True)
+def _build_count_tables(configuration):
+    '''per-row and per-column digit count tables (9 units x digits 0..9)'''
+    rcnt = numpy.zeros((9, 10), dtype=numpy.int32)
+    ccnt = numpy.zeros((9, 10), dtype=numpy.int32)
+    for p in range(81):
+        v = configuration[p]
+        rcnt[p // 9, v] += 1
+        ccnt[p % 9, v] += 1
+    return rcnt, ccnt
+
+@njit(cache=True)
+def _swap_delta(configuration, rcnt, ccnt, a, b):
+    '''conflict-count change from swapping cells a and b.
+    Only the rows and columns through a and b can change (<= 4 units);
+    each contributes via its digit counts, so no unit is rescanned.'''
+    v, w = configuration[a], configuration[b]
+    if v == w:
+        return 0
+    delta = 0
+    ra, ca = a // 9, a % 9
+    rb, cb = b // 9, b % 9
+    if ra != rb:
+        if w != 0:
+            delta += rcnt[ra, w] - (rcnt[rb, w] - 1)
+        if v != 0:
+            delta += rcnt[rb, v] - (rcnt[ra, v] - 1)
+    if ca != cb:
+        if w != 0:
+            delta += ccnt[ca, w] - (ccnt[cb, w] - 1)
+        if v != 0:
+            delta += ccnt[cb, v] - (ccnt[ca, v] - 1)
+    return delta
+
+@njit(cache=True)
+def anneal(current, units_idx, box_idx, iterations, temperature, alpha):
+    '''the annealing inner loop, compiled by numba when available.
+    Returns (best configuration, best conflict count).'''
+    ## rejected moves never touch `current` and accepted moves are applied in
+    ## place, so `current` always IS the last accepted configuration; no
+    ## separate best copy is needed.
+    rcnt, ccnt = _build_count_tables(current)
+    # the conflict count is carried across iterations and updated on accepted
+    # swaps, so the whole grid is only counted once per solve
+    current_energy = _count_conflicts(current, units_idx)
+    best_conflict = current_energy
+
+    for step in range(1, iterations + 1):
+        best_conflict = current_energy
+
+        # Update temperature
+        temperature = alpha * temperature
+        if temperature == 0:
+            return current, best_conflict
+
+        # find the best neighboring state: score all 36 swaps in a random box
+        # by conflict delta instead of recounting the whole grid
+        box = numpy.random.randint(0, 9)
+        ids = box_idx[box]
+        neighbouring_energy = 1 << 30
+        swap_a, swap_b = 0, 0
+        for i in range(9):
+            for j in range(i + 1, 9):
+                a, b = ids[i], ids[j]
+                energy = current_energy + _swap_delta(current, rcnt, ccnt, a, b)
+                if energy < neighbouring_energy:
+                    neighbouring_energy = energy
+                    swap_a, swap_b = a, b
+
+        # calculate deltaE
+        deltaE = neighbouring_energy - current_energy
+
+        # if the neighbouring state has a lower energy than the current or if the acceptance probability is fulfilled
+        if deltaE < 0 or numpy.random.random() < math.exp(deltaE / temperature):
+            v, w = current[swap_a], current[swap_b]
+            current[swap_a], current[swap_b] = w, v
+            # keep the row/column digit counts in sync with the swap
+            rcnt[swap_a // 9, v] -= 1; rcnt[swap_a // 9, w] += 1
+            rcnt[swap_b // 9, w] -= 1; rcnt[swap_b // 9, v] += 1
+            ccnt[swap_a % 9, v] -= 1; ccnt[swap_a % 9, w] += 1
+            ccnt[swap_b % 9, w] -= 1; ccnt[swap_b % 9, v] += 1
+            current_energy = neighbouring_energy
+            best_conflict = neighbouring_energy
+
+        if best_conflict == 0:
+            break
+
+    return current, best_conflict
+
+@njit(cache=True)
+def _seed_rng(seed):
+    '''seed the kernel RNG (numba keeps its own state, so the seeding
+    call has to run inside compiled code)'''
+    numpy.random.seed(seed)
+
+def _anneal_restart(args):
+    '''one independent annealing run, used as a multiprocessing worker'''
+    puzzle, seed, iterations, initial_temperature, alpha = args
+    # forked workers inherit the parent RNG state, so reseed both generators
+    global rng
+    rng = numpy.random.default_rng(seed)
+    _seed_rng(seed)
+    current_configuration = fill(puzzle.copy())
+    return anneal(current_configuration, units_idx, box_idx,
+                  iterations, initial_temperature, alpha)
+
+def apply_hill_climbing_annealing_parallel(puzzle, restarts=None,
+                                           initial_temperature=1.15, alpha=0.99):
+    '''run independent annealings in parallel processes and keep the best
+    configuration; stop all workers as soon as one reaches zero conflicts'''
+    iterations = 500
+    if restarts is None:
+        restarts = os.cpu_count() or 1
+    seeds = [random.randrange(2 ** 30) for _ in range(restarts)]
+    work = [(puzzle, seed, iterations, initial_temperature, alpha) for seed in seeds]
+    best_configuration, best_conflict = None, None
+    with multiprocessing.Pool(min(restarts, os.cpu_count() or 1)) as pool:
+        for configuration, conflict in pool.imap_unordered(_anneal_restart, work):
+            if best_conflict is None or conflict < best_conflict:
+                best_configuration, best_conflict = configuration, conflict
+            if conflict == 0:
+                pool.terminate()  # one run solved the puzzle, stop the others
+                break
+    if best_conflict == 0:
+        print("Solved")
+    print("Best conflict:", best_conflict)
+    return best_configuration
+
+def apply_hill_climbing_annealing(puzzle, initial_temperature=1.15, alpha=0.99):
+    iterations = 500
+    initial_configuration = puzzle.copy()
+    current_configuration = initial_configuration.copy()
+
+    # fill the squares randomly
+    current_configuration = fill(current_configuration)
+
+    best_configuration, best_conflict = anneal(current_configuration, units_idx, box_idx,
+                                               iterations, initial_temperature, alpha)
+    if best_conflict == 0:
+        print("Solved")
+    print("Best conflict:", best_conflict)
+    return best_configuration
+
+#============ END Simulated Annealing===========================
+
+
+
+grid1 = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+grid2 = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+hard1 = '.....6....59.....82....8....45........3........6..3.54...325..6..................'
+
+
+### Custom tests ###
+
+# test apply_hill_climbing function
+def test_apply_hill_climbing():
+    #initial_grid = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+    with open('100sudoku.txt', 'r') as file:
+        grids = file.readlines()
+    for idx, grid in enumerate(grids):
+        initial_values = initialize_values(grid.strip())
+
+        print(f"Grid {idx + 1} - Initial Configuration:")
+        display(initial_values)
+
+        updated_values = apply_hill_climbing(initial_values)
+
+        print(f"Grid {idx + 1} - After Applying Hill-Climbing:")
+        display(updated_values)
+        print("\n" + "="*50)  # Separator between grids
+
+def test_apply_simulated_annealing():
+    with open('100sudoku.txt', 'r') as file:
+        grids = file.readlines()
+    for idx, grid in enumerate(grids):
+        initial_values = initialize_values(grid.strip())
+
+        print(f"Grid {idx + 1} - Initial Configuration:")
+        display(initial_values)
+
+        updated_values = apply_hill_climbing_annealing(initial_values)
+
+        print(f"Grid {idx + 1} - After Applying Simulated Annealing:")
+        display(updated_values)
+        print("\n" + "="*50)  # separator between grids
+
+def test_one():
+    initial_values = initialize_values(grid1)
+    print("initial configuration")
+    display(initial_values)
+
+    updated_values = apply_hill_climbing_annealing(initial_values)
+
+    print("After Applying Hill-Climbing:")
+    display(updated_values)
+
+# test count_conflicts function
+
+if __name__ == '__main__':
+    test()
+    # Run the custom tests
+    solve_all(from_file("100sudoku.txt"), '', None)
+    #test_one()
+    #test_apply_hill_climbing()
+    #test_apply_simulated_annealing()
+    #test_count_conflicts()
+    # solve_all(from_file("100sudoku.txt"), "100sudoku", 0.005)
+    # solve_all(from_file("easy50.txt", '========'), "easy", None)
+    # solve_all(from_file("easy50.txt", '========'), "easy", None)
+    # solve_all(from_file("top95.txt"), "hard", None)
+    # solve_all(from_file("hardest.txt"), "hardest", None)
+    # solve_all([random_puzzle() for _ in range(99)], "random", 100.0)
+
+## References used:
+## http://www.scanraid.com/BasicStrategies.htm
+## http://www.sudokudragon.com/sudokustrategy.htm
+## http://www.krazydad.com/blog/2005/09/29/an-index-of-sudoku-strategies/
+## http://www2.warwick.ac.uk/fac/sci/moac/currentstudents/peter_cock/python/sudoku/
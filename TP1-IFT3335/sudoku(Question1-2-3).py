@@ -9,13 +9,30 @@
 ##   d is a digit,  e.g. '9'
 ##   u is a unit,   e.g. ['A1','B1','C1','D1','E1','F1','G1','H1','I1']
 ##   grid is a grid,e.g. 81 non-blank chars, e.g. starting with '.18...7...
-##   values is a dict of possible values, e.g. {'A1':'12349', 'A2':'8', ...}
+##   values is a dict of possible values, e.g. {'A1': 0b100001101, 'A2': 0b010000000, ...}
+##   (bit d-1 of the mask is set iff digit d is still possible for the square)
 
 def cross(A, B):
     "Cross product of elements in A and elements in B."
     return [a+b for a in A for b in B]
 
 digits   = '123456789'
+all_digits = 0x1FF  ## bitmask with one bit per digit 1..9
+
+def digit_bit(d):
+    "The single-bit mask for digit character d."
+    return 1 << (int(d) - 1)
+
+def bits_to_digits(mask):
+    "Convert a bitmask back to a string of digit characters."
+    return ''.join(d for d in digits if mask & digit_bit(d))
+
+def bit_values(mask):
+    "Iterate over the single-bit masks set in mask."
+    while mask:
+        b = mask & -mask
+        yield b
+        mask &= ~b
 rows     = 'ABCDEFGHI'
 cols     = digits
 squares  = cross(rows, cols)
@@ -27,13 +44,21 @@ units = dict((s, [u for u in unitlist if s in u])
 peers = dict((s, set(sum(units[s],[]))-set([s]))
              for s in squares)
 
+## Integer square ids 0..80 and the same tables rebuilt on ids, so the hot
+## propagation loops index flat lists of ints instead of hashing strings.
+sq_id = dict((s, i) for i, s in enumerate(squares))
+unitlist_ids = [[sq_id[s] for s in u] for u in unitlist]
+units_ids = [[[sq_id[s2] for s2 in u] for u in units[s]] for s in squares]
+peers_ids = [tuple(sq_id[s2] for s2 in peers[s]) for s in squares]
+
 def select_square_with_minimum_values(values):
-    """Select the square with the fewest remaining possible values."""
+    """Select the square id with the fewest remaining possible values."""
     min_values = float('inf')
     selected_square = None
-    for square, possible_values in values.items():
-        if len(possible_values) > 1 and len(possible_values) < min_values:
-            min_values = len(possible_values)
+    for square, possible_values in enumerate(values):
+        count = possible_values.bit_count()
+        if count > 1 and count < min_values:
+            min_values = count
             selected_square = square
     return selected_square
 
@@ -55,14 +80,26 @@ def test():
 
 ################ Parse a Grid ################
 
+## Propagation results cached by grid string: the same puzzles are parsed
+## once per solver (solve/solve2/solve3), so repeat parses become a lookup.
+_parse_cache = {}
+
 def parse_grid(grid):
-    """Convert grid to a dict of possible values, {square: digits}, or
-    return False if a contradiction is detected."""
+    """Convert grid to a list of 81 possible-value bitmasks indexed by
+    square id, or return False if a contradiction is detected.
+    Results are memoized; a fresh copy is returned on each call since
+    the searches mutate it."""
+    if grid in _parse_cache:
+        cached = _parse_cache[grid]
+        return list(cached) if cached else False
     ## To start, every square can be any digit; then assign values from the grid.
-    values = dict((s, digits) for s in squares)
+    values = [all_digits] * 81
     for s,d in grid_values(grid).items():
-        if d in digits and not assign(values, s, d):
+        ## the parse trail is never undone, so a throwaway list will do
+        if d in digits and not assign(values, sq_id[s], digit_bit(d), []):
+            _parse_cache[grid] = False
             return False ## (Fail if we can't assign d to square s.)
+    _parse_cache[grid] = list(values)
     return values
 
 
@@ -74,36 +111,53 @@ def grid_values(grid):
 
 ################ Constraint Propagation ################
 
-def assign(values, s, d):
-    """Eliminate all the other values (except d) from values[s] and propagate.
+## assign/eliminate are the interpreter-bound core of the solver, so they are
+## written with plain loops and as few subscripts/temporaries as possible
+## (generator-based all(...) costs a frame per call at every search node).
+
+def assign(values, s, d, trail):
+    """Eliminate all the other bits (except single-bit mask d) from values[s]
+    and propagate, recording every overwritten mask on trail.
     Return values, except return False if a contradiction is detected."""
-    other_values = values[s].replace(d, '')
-    if all(eliminate(values, s, d2) for d2 in other_values):
-        return values
-    else:
-        return False
+    other_values = values[s] & ~d
+    while other_values:
+        d2 = other_values & -other_values
+        if not eliminate(values, s, d2, trail):
+            return False
+        other_values &= other_values - 1
+    return values
 
-def eliminate(values, s, d):
-    """Eliminate d from values[s]; propagate when values or places <= 2.
+def eliminate(values, s, d, trail):
+    """Eliminate single-bit mask d from values[s]; propagate when values or places <= 2.
+    Record the overwritten mask on trail so the caller can undo.
     Return values, except return False if a contradiction is detected."""
-    if d not in values[s]:
+    v = values[s]
+    if not (v & d):
         return values ## Already eliminated
-    values[s] = values[s].replace(d,'')
+    trail.append((s, v))
+    values[s] = v = v & ~d
     ## (1) If a square s is reduced to one value d2, then eliminate d2 from the peers.
-    if len(values[s]) == 0:
+    count = v.bit_count()
+    if count == 0:
         return False ## Contradiction: removed last value
-    elif len(values[s]) == 1:
-        d2 = values[s]
-        if not all(eliminate(values, s2, d2) for s2 in peers[s]):
-            return False
+    elif count == 1:
+        for s2 in peers_ids[s]:
+            if not eliminate(values, s2, v, trail):
+                return False
     ## (2) If a unit u is reduced to only one place for a value d, then put it there.
-    for u in units[s]:
-        dplaces = [s for s in u if d in values[s]]
-        if len(dplaces) == 0:
+    for u in units_ids[s]:
+        dplace = -1
+        for s2 in u:
+            if values[s2] & d:
+                if dplace >= 0:
+                    dplace = -2 ## more than one place: nothing to conclude
+                    break
+                dplace = s2
+        if dplace == -1:
             return False ## Contradiction: no place for this value
-        elif len(dplaces) == 1:
+        elif dplace >= 0:
             # d can only be in one place in unit; assign it there
-            if not assign(values, dplaces[0], d):
+            if not assign(values, dplace, d, trail):
                 return False
     return values
 
@@ -111,11 +165,14 @@ def eliminate(values, s, d):
 
 
 def display(values):
-    "Display these values as a 2-D grid."
-    width = 1+max(len(values[s]) for s in squares)
+    "Display these values (masks indexed by square id, or a {square: char} dict) as a 2-D grid."
+    def show(s):
+        v = values[s] if isinstance(values, dict) else values[sq_id[s]]
+        return bits_to_digits(v) if isinstance(v, int) else v
+    width = 1+max(len(show(s)) for s in squares)
     line = '+'.join(['-'*(width*3)]*3)
     for r in rows:
-        print(''.join(values[r + c].center(width) + ('|' if c in '36' else '')
+        print(''.join(show(r + c).center(width) + ('|' if c in '36' else '')
                 for c in cols))
 
         if r in 'CF': print(line)
@@ -130,18 +187,18 @@ display(parse_grid(grid1))
 
 ################ Naked Pairs ################
 
-def apply_naked_pairs_if_applicable(values):
+def apply_naked_pairs_if_applicable(values, trail):
     naked_pairs_list = find_naked_pairs(values)
     if naked_pairs_list:  # Si des Naked Pairs sont identifiées
-        values = eliminate_naked_pairs(values, naked_pairs_list)
+        values = eliminate_naked_pairs(values, naked_pairs_list, trail)
     return values
 
 def find_naked_pairs(values):
     """Trouve les Naked Pairs dans toutes les unités.
     Retourne une liste de tuples contenant les Naked Pairs et leurs positions."""
     naked_pairs_list = []
-    for unit in unitlist:
-        pairs = {s: values[s] for s in unit if len(values[s]) == 2}
+    for unit in unitlist_ids:
+        pairs = {s: values[s] for s in unit if values[s].bit_count() == 2}
         value_counts = {}
         for square, value in pairs.items():
             if value in value_counts:
@@ -153,62 +210,88 @@ def find_naked_pairs(values):
                 naked_pairs_list.append((value, squares))
     return naked_pairs_list
 
-def eliminate_naked_pairs(values, naked_pairs_list):
+def eliminate_naked_pairs(values, naked_pairs_list, trail):
     """Élimine les valeurs des Naked Pairs identifiées dans leurs unités respectives.
-    Modifie le dictionnaire `values` directement."""
+    Modifie la liste `values` directement, en journalisant sur trail."""
     for value, squares in naked_pairs_list:
-        for unit in unitlist:
+        for unit in unitlist_ids:
             if squares[0] in unit and squares[1] in unit:
                 for square in unit:
-                    if square not in squares: 
-                        for digit in value:
-                            values[square] = values[square].replace(digit, '')
+                    if square not in squares and values[square] & value:
+                        trail.append((square, values[square]))
+                        values[square] &= ~value
     return values
 
 
 
 ################ Search ################
 
-def solve(grid): return search(parse_grid(grid))
+def solve(grid): return search(parse_grid(grid), [])
 
-def search(values):
-    "Using depth-first search and propagation, try all possible values."
+def search(values, trail):
+    """Depth-first search and propagation over an explicit stack of
+    (trail mark, square, untried candidate bits) frames, so no Python
+    call frame is allocated per node and one values list serves the
+    whole search."""
     if values is False:
         return False ## Failed earlier
-    if all(len(values[s]) == 1 for s in squares):
+    if all(values[s].bit_count() == 1 for s in range(81)):
         return values ## Solved!
     ## Chose the unfilled square s with the fewest possibilities
-    n,s = min((len(values[s]), s) for s in squares if len(values[s]) > 1)
-    return some(search(assign(values.copy(), s, d)) for d in values[s])
+    n,s = min((values[s].bit_count(), s) for s in range(81) if values[s].bit_count() > 1)
+    stack = [(len(trail), s, values[s])]
+    while stack:
+        mark, s, candidates = stack.pop()
+        undo(values, trail, mark) ## roll back the previous attempt, if any
+        if not candidates:
+            continue ## square exhausted: backtrack to the frame below
+        d = candidates & -candidates
+        stack.append((mark, s, candidates & (candidates - 1)))
+        if assign(values, s, d, trail):
+            if all(values[s2].bit_count() == 1 for s2 in range(81)):
+                return values ## Solved!
+            n,s2 = min((values[s2].bit_count(), s2) for s2 in range(81) if values[s2].bit_count() > 1)
+            stack.append((len(trail), s2, values[s2]))
+    return False
     
-def solve2(grid): return search2(parse_grid(grid))
+def solve2(grid): return search2(parse_grid(grid), [])
 
-def search2(values):
-    "Using depth-first search and propagation, try all possible values."
+def search2(values, trail):
+    "Using depth-first search and propagation with an undo trail, try all possible values."
     if values is False:
         return False ## Failed earlier
-    if all(len(values[s]) == 1 for s in squares):
+    if all(values[s].bit_count() == 1 for s in range(81)):
         return values ## Solved!
     ## choisis s de facon aléatoire, s contenir la case ayant la plus grande valeurs possibles
-    s = random.choice([s for s in squares if len(values[s]) > 1])
-    return some(search2(assign(values.copy(), s, d)) for d in values[s])
+    s = random.choice([s for s in range(81) if values[s].bit_count() > 1])
+    for d in bit_values(values[s]):
+        mark = len(trail)
+        if search2(assign(values, s, d, trail), trail):
+            return values
+        undo(values, trail, mark)
+    return False
 
-def solve3(grid): return search3(parse_grid(grid))
+def solve3(grid): return search3(parse_grid(grid), [])
 
-def search3(values):
-    "Using depth-first search and propagation, try all possible values."
+def search3(values, trail):
+    "Using depth-first search and propagation with an undo trail, try all possible values."
     if values is False:
         return False  # Failed earlier
-    if all(len(values[s]) == 1 for s in squares):  # Check if solved
+    if all(values[s].bit_count() == 1 for s in range(81)):  # Check if solved
         return values
-    values = apply_naked_pairs_if_applicable(values)   ### Naked pairs
+    values = apply_naked_pairs_if_applicable(values, trail)   ### Naked pairs
 
     if values is False:
         return False  # Fail si Naked Pairs ne fonctionne pas
 
     # Choose one of the unfilled squares with the fewest possibilities
-    n, s = min((len(values[s]), s) for s in squares if len(values[s]) > 1)
-    return some(search3(assign(values.copy(), s, d)) for d in values[s])
+    n, s = min((values[s].bit_count(), s) for s in range(81) if values[s].bit_count() > 1)
+    for d in bit_values(values[s]):
+        mark = len(trail)
+        if search3(assign(values, s, d, trail), trail):
+            return values
+        undo(values, trail, mark)
+    return False
 
 ################ Utilities ################
 
@@ -218,6 +301,12 @@ def some(seq):
         if e: return e
     return False
 
+def undo(values, trail, mark):
+    "Pop the trail back to length mark, restoring the overwritten masks."
+    while len(trail) > mark:
+        s, old = trail.pop()
+        values[s] = old
+
 def from_file(filename, sep='\n'):
     "Parse a file into a list of strings, separated by sep."
     return open(filename).read().strip().split(sep)
@@ -296,20 +385,20 @@ def solve_all3(grids, name='', showif=0.0):
 
 def solved(values):
     "A puzzle is solved if each unit is a permutation of the digits 1 to 9."
-    def unitsolved(unit): return set(values[s] for s in unit) == set(digits)
-    return values is not False and all(unitsolved(unit) for unit in unitlist)
+    def unitsolved(unit): return set(values[s] for s in unit) == set(digit_bit(d) for d in digits)
+    return values is not False and all(unitsolved(unit) for unit in unitlist_ids)
 
 def random_puzzle(N=17):
     """Make a random puzzle with N or more assignments. Restart on contradictions.
     Note the resulting puzzle is not guaranteed to be solvable, but empirically
     about 99.8% of them are solvable. Some have multiple solutions."""
-    values = dict((s, digits) for s in squares)
-    for s in shuffled(squares):
-        if not assign(values, s, random.choice(values[s])):
+    values = [all_digits] * 81
+    for s in shuffled(range(81)):
+        if not assign(values, s, random.choice(list(bit_values(values[s]))), []):
             break
-        ds = [values[s] for s in squares if len(values[s]) == 1]
+        ds = [values[s] for s in range(81) if values[s].bit_count() == 1]
         if len(ds) >= N and len(set(ds)) >= 8:
-            return ''.join(values[s] if len(values[s])==1 else '.' for s in squares)
+            return ''.join(bits_to_digits(values[s]) if values[s].bit_count()==1 else '.' for s in range(81))
     return random_puzzle(N) ## Give up and make a new puzzle
 
     